@@ -1,20 +1,36 @@
 #!/usr/bin/env python3
 # SIA Offline Verifier — Phase 7B (Standard library only)
 
-import argparse
-import hashlib
-import json
+# Only os/sys are imported eagerly (both are already loaded by the interpreter).
+# hashlib, json and argparse are imported where first needed so that hook-driven
+# runs (especially --check-manifest-only) pay as little startup cost as possible.
+
 import os
 import sys
 
+# Deferred modules, bound as globals on first use (per-record code then pays
+# only a global lookup, not an import statement).
+hashlib = None
+json = None
+
+def load_hashlib():
+    global hashlib
+    import hashlib
+    return hashlib
+
+def load_json():
+    global json
+    import json
+    return json
+
 CANONICAL_ADVISE = "use classical analysis (limits/asymptotics/numerical methods) with explicit acknowledgement of approximation"
 GENESIS_FALLBACK = "GENESIS"
 
 def sha256_hex(b: bytes) -> str:
-    return hashlib.sha256(b).hexdigest()
+    return (hashlib or load_hashlib()).sha256(b).hexdigest()
 
 def file_sha256(path: str) -> str:
-    h = hashlib.sha256()
+    h = (hashlib or load_hashlib()).sha256()
     with open(path, "rb") as f:
         while True:
             chunk = f.read(1024 * 1024)
@@ -48,9 +64,22 @@ def load_manifest(manifest_path: str):
 
     return items
 
-def verify_manifest(bundle_dir: str, manifest_path: str):
+def verify_manifest(bundle_dir: str, manifest_path: str, only=None, exclude=()):
+    """
+    Verify manifest hashes. `only` restricts the check to the given files (each
+    must be listed); `exclude` skips files checked elsewhere (e.g. shards
+    verified on other hosts).
+    """
     items = load_manifest(manifest_path)
+    if only is not None:
+        listed = {rel for _, rel in items}
+        for rel in only:
+            if rel not in listed:
+                raise ValueError(f"File not listed in manifest: {rel}")
+        items = [(digest, rel) for digest, rel in items if rel in only]
     for digest, rel in items:
+        if rel in exclude:
+            continue
         abspath = os.path.join(bundle_dir, rel)
         if not os.path.isfile(abspath):
             raise ValueError(f"Missing file listed in manifest: {rel}")
@@ -59,25 +88,33 @@ def verify_manifest(bundle_dir: str, manifest_path: str):
             raise ValueError(f"Hash mismatch for {rel}: expected {digest}, got {got}")
     return True
 
-def read_jsonl(path: str):
-    records = []
+def iter_jsonl(path: str):
+    """
+    Lazily yield parsed records. Records are not retained, so large chains
+    are verified in constant memory (and without list-driven GC overhead).
+    """
+    loads = (json or load_json()).loads
+    n = 0
     with open(path, "r", encoding="utf-8") as f:
         for ln, line in enumerate(f, 1):
             line = line.strip()
             if not line:
                 continue
             try:
-                rec = json.loads(line)
+                rec = loads(line)
             except Exception as e:
                 raise ValueError(f"JSONL parse error at line {ln}: {e}")
-            records.append(rec)
-    if not records:
+            n += 1
+            yield rec
+    if not n:
         raise ValueError("JSONL is empty.")
-    return records
+
+def read_jsonl(path: str):
+    return list(iter_jsonl(path))
 
 def canonical_json(obj: dict) -> str:
     # Match Phase 7A: ensure_ascii=True, separators=(",",":")
-    return json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=True)
+    return (json or load_json()).dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=True)
 
 def canonical_body_for_cert(rec: dict) -> str:
     """
@@ -151,15 +188,33 @@ def finality_seal_id(rec: dict):
         return rec.get("seal_id")
     return None
 
-def verify_records(records):
-    seal_index = None
-    seal_id = None
-    sealed_chain_hash = None
+def genesis_prev_chain_hash(rec: dict) -> str:
+    return rec.get("prev_chain_hash") or rec.get("inputs", {}).get("seal_prev_chain_hash") or GENESIS_FALLBACK
 
-    prev_chain_hash = None
+def verify_chain(records, start=None):
+    """
+    Verify a contiguous run of records and return the chain state after it.
+
+    start=None begins a whole chain (prev_chain_hash derived from the first
+    record). A shard instead starts from the state declared in SHARDS.jsonl:
+        {"first_record": n, "prev_chain_hash": ..., "seal_id": ... or None}
+
+    The returned state has the same shape and is the start state of the next
+    shard. After the seal chain_hash is frozen, so prev_chain_hash is also the
+    sealed chain_hash.
+    """
+    if start is None:
+        start = {"first_record": 1, "prev_chain_hash": None, "seal_id": None}
+
+    first_record = start["first_record"]
+    prev_chain_hash = start["prev_chain_hash"]
+    seal_id = start["seal_id"]
+    sealed_chain_hash = prev_chain_hash if seal_id is not None else None
 
-    for i, rec in enumerate(records):
+    i = first_record - 1
+    for i, rec in enumerate(records, first_record):
         require_keys(rec, ["mode", "phase", "label", "op", "decision", "reason", "certificate_id", "chain_hash", "a_decimals"])
+        post_seal = seal_id is not None
 
         # Advise discipline
         advise = rec.get("advise", None)
@@ -174,11 +229,11 @@ def verify_records(records):
         # certificate_id must always recompute correctly
         cid_expected = recompute_certificate_id(rec)
         if cid_expected != rec["certificate_id"]:
-            raise ValueError(f"certificate_id mismatch at record {i+1} (label={rec.get('label')})")
+            raise ValueError(f"certificate_id mismatch at record {i} (label={rec.get('label')})")
 
-        # Determine prev_chain_hash for the FIRST record only
-        if i == 0:
-            prev_chain_hash = rec.get("prev_chain_hash") or rec.get("inputs", {}).get("seal_prev_chain_hash") or GENESIS_FALLBACK
+        # Determine prev_chain_hash for the FIRST record of a whole chain only
+        if prev_chain_hash is None:
+            prev_chain_hash = genesis_prev_chain_hash(rec)
 
         # chain_hash rule:
         # - before seal: advances as sha256(prev || "|" || certificate_id)
@@ -187,17 +242,16 @@ def verify_records(records):
         if sealed_chain_hash is None:
             ch_expected = recompute_chain_hash(prev_chain_hash, rec["certificate_id"])
             if ch_expected != rec["chain_hash"]:
-                raise ValueError(f"chain_hash mismatch at record {i+1} (label={rec.get('label')})")
+                raise ValueError(f"chain_hash mismatch at record {i} (label={rec.get('label')})")
             prev_chain_hash = rec["chain_hash"]
         else:
             if rec.get("chain_hash") != sealed_chain_hash:
-                raise ValueError(f"Post-seal chain_hash changed at record {i+1} (must remain stable after seal).")
+                raise ValueError(f"Post-seal chain_hash changed at record {i} (must remain stable after seal).")
 
         # Seal assertions handling
         if rec.get("op") == "seal" and rec.get("sealed") is True:
-            if seal_index is None:
+            if seal_id is None:
                 # First seal assertion is the canonical seal event
-                seal_index = i
                 seal_id = rec.get("seal_id") or rec.get("certificate_id")
                 sealed_chain_hash = rec.get("chain_hash")
             else:
@@ -210,14 +264,8 @@ def verify_records(records):
                 if rec.get("chain_hash") != sealed_chain_hash:
                     raise ValueError("Post-seal seal assertion must preserve sealed chain_hash.")
 
-    if seal_index is None:
-        raise ValueError("No finality seal record found (op='seal' and sealed=true).")
-
-    # Post-seal discipline checks (issue/ops are frozen, must ABSTAIN for proof_assistant_cert)
-    for j in range(seal_index + 1, len(records)):
-        rec = records[j]
-
-        if rec.get("mode") == "proof_assistant_cert":
+        # Post-seal discipline checks (issue/ops are frozen, must ABSTAIN for proof_assistant_cert)
+        if post_seal and rec.get("mode") == "proof_assistant_cert":
             if rec.get("decision") != "ABSTAIN":
                 raise ValueError(f"Post-seal issuance must ABSTAIN (label={rec.get('label')})")
             # Be permissive here: some post-seal refusals may use "ALREADY_SEALED" style.
@@ -232,20 +280,159 @@ def verify_records(records):
                 if fin.get("seal_id") and fin.get("seal_id") != seal_id:
                     raise ValueError(f"finality.seal_id mismatch (label={rec.get('label')})")
 
+    return {"first_record": i + 1, "prev_chain_hash": prev_chain_hash, "seal_id": seal_id}
+
+def verify_records(records):
+    state = verify_chain(records)
+    if state["seal_id"] is None:
+        raise ValueError("No finality seal record found (op='seal' and sealed=true).")
     return True
 
-def main():
+SHARD_KEYS = ["shard", "file", "first_record", "records", "prev_chain_hash", "chain_hash", "prev_seal_id", "seal_id"]
+
+def load_shards(shards_path: str):
+    entries = read_jsonl(shards_path)
+    for k, entry in enumerate(entries):
+        require_keys(entry, SHARD_KEYS)
+        if entry["shard"] != k:
+            raise ValueError(f"Shard index out of order at line {k+1} (expected shard {k}).")
+    return entries
+
+def verify_shard(bundle_dir: str, entry: dict):
+    """
+    Verify one shard against its SHARDS.jsonl entry, independently of the others.
+    Whether neighbouring entries agree is checked separately by verify_shard_links.
+    """
+    k = entry["shard"]
+    records = iter_jsonl(os.path.join(bundle_dir, entry["file"]))
+    if k == 0:
+        import itertools
+        first = next(records)
+        if entry["prev_chain_hash"] != genesis_prev_chain_hash(first):
+            raise ValueError("Shard 0 prev_chain_hash does not match the chain's first record.")
+        records = itertools.chain((first,), records)
+
+    start = {"first_record": entry["first_record"], "prev_chain_hash": entry["prev_chain_hash"], "seal_id": entry["prev_seal_id"]}
+    state = verify_chain(records, start)
+    got = state["first_record"] - entry["first_record"]
+    if got != entry["records"]:
+        raise ValueError(f"Shard {k} record count mismatch: expected {entry['records']}, got {got}")
+    if state["prev_chain_hash"] != entry["chain_hash"]:
+        raise ValueError(f"Shard {k} ending chain_hash mismatch.")
+    if state["seal_id"] != entry["seal_id"]:
+        raise ValueError(f"Shard {k} ending seal_id mismatch.")
+    return True
+
+def verify_shards(bundle_dir: str, entries, jobs: int = 1):
+    if jobs > 1 and len(entries) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=jobs) as ex:
+            list(ex.map(verify_shard, [bundle_dir] * len(entries), entries))
+    else:
+        for entry in entries:
+            verify_shard(bundle_dir, entry)
+    return True
+
+def verify_shard_links(entries, manifest_rels):
+    """
+    Check that shard boundaries link up: each shard starts where the previous
+    one ended (record number, chain_hash, seal state), and every shard file is
+    covered by MANIFEST.sha256. Reads SHARDS.jsonl only, no shard contents.
+    """
+    state = {"first_record": 1, "prev_chain_hash": None, "seal_id": None}
+    for entry in entries:
+        k = entry["shard"]
+        if entry["file"] not in manifest_rels:
+            raise ValueError(f"Shard {k} file not listed in manifest: {entry['file']}")
+        if entry["records"] < 1:
+            raise ValueError(f"Shard {k} is empty.")
+        if entry["first_record"] != state["first_record"]:
+            raise ValueError(f"Shard {k} first_record does not follow shard {k-1}.")
+        if k > 0 and entry["prev_chain_hash"] != state["prev_chain_hash"]:
+            raise ValueError(f"Shard {k} prev_chain_hash does not link to shard {k-1} chain_hash.")
+        if entry["prev_seal_id"] != state["seal_id"]:
+            raise ValueError(f"Shard {k} prev_seal_id does not link to shard {k-1} seal_id.")
+        state = {"first_record": entry["first_record"] + entry["records"], "prev_chain_hash": entry["chain_hash"], "seal_id": entry["seal_id"]}
+    if state["seal_id"] is None:
+        raise ValueError("No finality seal record found (op='seal' and sealed=true).")
+    return True
+
+ARG_DEFAULTS = {
+    "bundle_dir": None,
+    "certs": None,
+    "manifest": "MANIFEST.sha256",
+    "shards": "SHARDS.jsonl",
+    "shard": None,
+    "jobs": 1,
+    "check_manifest_only": False,
+    "check_links": False,
+}
+
+VALUE_ARGS = {"bundle_dir": str, "certs": str, "manifest": str, "shards": str, "shard": int, "jobs": int}
+FLAG_ARGS = {"--check-manifest-only": "check_manifest_only", "--check-links": "check_links"}
+
+def parse_args_full(argv):
+    import argparse
     ap = argparse.ArgumentParser()
     ap.add_argument("--bundle_dir", required=True, help="Bundle directory containing CERTS.jsonl and MANIFEST.sha256")
-    ap.add_argument("--certs", default="CERTS.jsonl")
-    ap.add_argument("--manifest", default="MANIFEST.sha256")
-    args = ap.parse_args()
+    ap.add_argument("--certs", default=ARG_DEFAULTS["certs"], help="Certificate chain file (default CERTS.jsonl; not valid for sharded bundles)")
+    ap.add_argument("--manifest", default=ARG_DEFAULTS["manifest"])
+    ap.add_argument("--shards", default=ARG_DEFAULTS["shards"], help="Shard index of a sharded bundle")
+    ap.add_argument("--shard", type=int, default=None, help="Verify a single shard of a sharded bundle")
+    ap.add_argument("--jobs", type=int, default=ARG_DEFAULTS["jobs"], help="Worker processes for verifying shards")
+    ap.add_argument("--check-manifest-only", action="store_true", help="Verify MANIFEST.sha256 only (skip JSON parsing and chain checks)")
+    ap.add_argument("--check-links", action="store_true", help="Verify shard boundary links only (shards verified separately with --shard)")
+    return vars(ap.parse_args(argv))
+
+def parse_args(argv):
+    """
+    Fast path for the fixed flag set (avoids importing argparse).
 
-    bundle_dir = args.bundle_dir
-    certs_path = os.path.join(bundle_dir, args.certs)
-    manifest_path = os.path.join(bundle_dir, args.manifest)
+    Anything unexpected (--help, unknown or abbreviated flags, missing values)
+    falls through to argparse so usage and error messages stay unchanged.
+    """
+    opts = dict(ARG_DEFAULTS)
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        if arg in FLAG_ARGS:
+            opts[FLAG_ARGS[arg]] = True
+            i += 1
+            continue
+        key, sep, val = arg.partition("=")
+        name = key[2:] if key.startswith("--") else ""
+        if name not in VALUE_ARGS:
+            return parse_args_full(argv)
+        if not sep:
+            if i + 1 >= len(argv) or argv[i + 1].startswith("-"):
+                return parse_args_full(argv)
+            val = argv[i + 1]
+            i += 1
+        try:
+            opts[name] = VALUE_ARGS[name](val)
+        except ValueError:
+            return parse_args_full(argv)
+        i += 1
+    if opts["bundle_dir"] is None:
+        return parse_args_full(argv)
+    return opts
 
-    if not os.path.isfile(certs_path):
+def main():
+    args = parse_args(sys.argv[1:])
+
+    bundle_dir = args["bundle_dir"]
+    certs_path = os.path.join(bundle_dir, args["certs"] or "CERTS.jsonl")
+    manifest_path = os.path.join(bundle_dir, args["manifest"])
+    shards_path = os.path.join(bundle_dir, args["shards"])
+    sharded = os.path.isfile(shards_path)
+
+    if args["certs"] is not None and sharded:
+        print(f"VERIFY: FAIL (--certs cannot be used with a sharded bundle; {args['shards']} lists the certificate shards)")
+        return 2
+    if (args["shard"] is not None or args["check_links"]) and not sharded:
+        print("VERIFY: FAIL (missing SHARDS.jsonl; --shard/--check-links need a sharded bundle)")
+        return 2
+    if not args["check_manifest_only"] and not sharded and not os.path.isfile(certs_path):
         print("VERIFY: FAIL (missing CERTS.jsonl)")
         return 2
     if not os.path.isfile(manifest_path):
@@ -253,9 +440,43 @@ def main():
         return 2
 
     try:
+        if args["check_manifest_only"]:
+            verify_manifest(bundle_dir, manifest_path)
+            print("VERIFY: PASS (manifest only)")
+            return 0
+
+        if not sharded:
+            verify_manifest(bundle_dir, manifest_path)
+            verify_records(iter_jsonl(certs_path))
+            print("VERIFY: PASS")
+            return 0
+
+        # Sharded bundle: a full run is equivalent to --shard K for every K
+        # (possibly on different hosts) followed by --check-links.
+        entries = load_shards(shards_path)
+        shard_files = {entry["file"] for entry in entries}
+
+        if args["shard"] is not None:
+            k = args["shard"]
+            if not 0 <= k < len(entries):
+                raise ValueError(f"No such shard: {k} (bundle has {len(entries)})")
+            verify_manifest(bundle_dir, manifest_path, only={args["shards"], entries[k]["file"]})
+            verify_shard(bundle_dir, entries[k])
+            print(f"VERIFY: PASS (shard {k})")
+            return 0
+
+        manifest_rels = {rel for _, rel in load_manifest(manifest_path)}
+        if args["shards"] not in manifest_rels:
+            raise ValueError(f"File not listed in manifest: {args['shards']}")
+        if args["check_links"]:
+            verify_manifest(bundle_dir, manifest_path, exclude=shard_files)
+            verify_shard_links(entries, manifest_rels)
+            print("VERIFY: PASS (links)")
+            return 0
+
         verify_manifest(bundle_dir, manifest_path)
-        records = read_jsonl(certs_path)
-        verify_records(records)
+        verify_shard_links(entries, manifest_rels)
+        verify_shards(bundle_dir, entries, args["jobs"])
     except Exception as e:
         print(f"VERIFY: FAIL ({e})")
         return 2
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# Startup regression benchmark for VERIFY.py (SIA)
+# Standard library only. Runs the verifier under `python -X importtime` and
+# reports import cost per mode; fails if deferred modules leak into a mode.
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+DEFAULT_BUNDLE_DIR = "SIA_AUDIT_BUNDLE_v1_8_phase7b_20260202_174009"
+BUILDER_PY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sia_smoketest_v1_8_phase7b.py")
+
+# mode: (extra VERIFY.py args, modules it must NOT import, needs a sharded bundle).
+# The forbidden modules are deferred in VERIFY.py; concurrent.futures is only
+# needed for --jobs > 1.
+DEFERRED = ["argparse", "subprocess", "shutil", "datetime", "concurrent.futures"]
+MODES = {
+    "manifest_only": (["--check-manifest-only"], DEFERRED + ["json"], False),
+    "full": ([], DEFERRED, False),
+    "sharded_full": (["--jobs", "1"], DEFERRED, True),
+    "shard": (["--shard", "0"], DEFERRED, True),
+    "links": (["--check-links"], DEFERRED, True),
+}
+
+
+def parse_importtime(stderr: str):
+    """
+    Parse `-X importtime` output into (name, self_us, cumulative_us) rows.
+    Only top-level imports are kept (nested ones are included in cumulative).
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        self_us, cum_us, name = parts
+        if not self_us.strip().isdigit():
+            continue  # header line
+        # Drop the single separator space; remaining indent encodes nesting depth.
+        rows.append((name[1:].rstrip(), int(self_us), int(cum_us)))
+    return rows
+
+
+def run_once(verify_py: str, bundle_dir: str, extra_args):
+    cmd = [sys.executable, "-X", "importtime", verify_py, "--bundle_dir", bundle_dir] + list(extra_args)
+    p = subprocess.run(cmd, capture_output=True, text=True)
+    if p.returncode != 0:
+        raise RuntimeError(f"VERIFY.py failed ({p.returncode}): {(p.stdout or '').strip()}")
+    return parse_importtime(p.stderr or "")
+
+
+def startup_modules():
+    # Interpreter startup imports (site, encodings, ...) are not ours to optimise.
+    p = subprocess.run([sys.executable, "-X", "importtime", "-c", "pass"], capture_output=True, text=True)
+    return {name.strip() for name, _, _ in parse_importtime(p.stderr or "")}
+
+
+def build_sharded_bundle(bundle_dir: str, out_dir: str):
+    # Re-shard the bundle's chain (2 records per shard) with the real builder.
+    cmd = [
+        sys.executable, BUILDER_PY,
+        "--in_jsonl", os.path.join(bundle_dir, "CERTS.jsonl"),
+        "--bundle_dir", out_dir,
+        "--shard_records", "2",
+        "--overwrite",
+    ]
+    p = subprocess.run(cmd, capture_output=True, text=True)
+    if p.returncode != 0:
+        raise RuntimeError(f"Sharded bundle build failed ({p.returncode}): {(p.stdout or '').strip()}")
+    return out_dir
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--bundle_dir", default=DEFAULT_BUNDLE_DIR, help="Bundle directory containing VERIFY.py")
+    ap.add_argument("--runs", type=int, default=7, help="Runs per mode (min is reported)")
+    ap.add_argument("--max_us", type=int, default=None, help="Fail if any mode's import cost (us) exceeds this")
+    args = ap.parse_args()
+
+    bundle_dir = args.bundle_dir
+    verify_py = os.path.join(bundle_dir, "VERIFY.py")
+    if not os.path.isfile(verify_py):
+        print(f"ERROR: VERIFY.py not found in {bundle_dir}")
+        return 2
+
+    startup = startup_modules()
+    failed = False
+
+    tmp_dir = None
+    if os.path.isfile(os.path.join(bundle_dir, "SHARDS.jsonl")):
+        sharded_dir = bundle_dir
+    else:
+        tmp_dir = tempfile.mkdtemp(prefix="sia_bench_")
+        sharded_dir = build_sharded_bundle(bundle_dir, os.path.join(tmp_dir, "bundle"))
+
+    try:
+        failed = run_modes(args, bundle_dir, sharded_dir, startup)
+    finally:
+        if tmp_dir is not None:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    if failed:
+        return 2
+    print("BENCH_IMPORTTIME: PASS")
+    return 0
+
+
+def run_modes(args, bundle_dir: str, sharded_dir: str, startup):
+    failed = False
+    for mode, (extra_args, forbidden, sharded) in MODES.items():
+        mode_dir = sharded_dir if sharded else bundle_dir
+        mode_verify_py = os.path.join(mode_dir, "VERIFY.py")
+        best = None
+        imported = set()
+        for _ in range(max(1, args.runs)):
+            rows = run_once(mode_verify_py, mode_dir, extra_args)
+            imported = {name.strip() for name, _, _ in rows}
+            top = [r for r in rows if not r[0].startswith(" ") and r[0] not in startup]
+            total = sum(cum for _, _, cum in top)
+            best = total if best is None else min(best, total)
+
+        leaked = sorted(m for m in forbidden if m in imported)
+        print(f"BENCH_IMPORTTIME[{mode}]: {best} us")
+        if leaked:
+            print(f"BENCH_IMPORTTIME[{mode}]: FAIL (imported deferred modules: {', '.join(leaked)})")
+            failed = True
+        if args.max_us is not None and best > args.max_us:
+            print(f"BENCH_IMPORTTIME[{mode}]: FAIL (exceeds budget {args.max_us} us)")
+            failed = True
+    return failed
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())